@@ -1,5 +1,10 @@
 import random
 import json
+import math
+import time
+import os
+import threading
+from collections import deque
 
 def load_wage_rules(file_path):
     """
@@ -147,16 +152,18 @@ Technique Demonstrated – Generator expression used within a weighted scoring s
 This function calculates an overall customer satisfaction score based on
 staff efficiency, cleanliness, and average wait time. It normalizes the wait
 time to a 0–100 scale (lower wait = better) and uses a generator expression
-to apply dynamic weights to each metric.
+to apply dynamic weights to each metric. Custom weights can be passed as
+metric_weights, a dict with the same three keys.
 """
 
-def calculate_satisfaction(staff_efficiency, cleanliness, wait_time):
+def calculate_satisfaction(staff_efficiency, cleanliness, wait_time, metric_weights=None):
     # Define weights for each factor
-    metric_weights = {
-        'staff_efficiency': 0.4,
-        'cleanliness': 0.3,
-        'wait_time': 0.3
-    }
+    if metric_weights is None:
+        metric_weights = {
+            'staff_efficiency': 0.4,
+            'cleanliness': 0.3,
+            'wait_time': 0.3
+        }
 
     # Normalize wait time: lower wait increases satisfaction
     metrics = {
@@ -172,7 +179,204 @@ def calculate_satisfaction(staff_efficiency, cleanliness, wait_time):
 
 
 
-def trigger_random_event(probability_positive, event_list, restaurant_state):
+def build_state_slots(state_keys):
+    """
+    Maps each restaurant state key to a fixed slot index so that event effects
+    can be compiled once and applied without per-key lookups.
+
+    Parameters:
+    - state_keys (iterable): state keys in slot order, e.g. tuple(restaurant_state).
+
+    Returns:
+    - dict: Mapping of state key (str) to slot index (int).
+    """
+    return {key: slot for slot, key in enumerate(state_keys)}
+
+
+def compile_effect(effect, slots):
+    """
+    Compiles an event effect into a sparse vector of (slot, factor, delta)
+    entries. Applying an entry sets the slot to value * factor + delta.
+
+    An effect value can be a plain number (added to the state), or a tuple
+    ('+', delta) / ('*', factor) for additive or multiplicative effects. Lists
+    such as ["*", 0.9], as loaded from JSON, work the same as tuples.
+    Keys that have no slot in the state are ignored.
+
+    Parameters:
+    - effect (dict): Mapping of state key to its effect value.
+    - slots (dict): Mapping of state key to slot index (see build_state_slots).
+
+    Returns:
+    - tuple: Sorted (slot, factor, delta) entries, one per affected slot.
+
+    Raises:
+    - ValueError: If an effect uses an unknown operator.
+    """
+    compiled = {}
+    for key, change in effect.items():
+        if key not in slots:
+            continue
+        op, value = change if isinstance(change, (tuple, list)) else ('+', change)
+        factor, delta = compiled.get(slots[key], (1, 0))
+        if op == '+':
+            delta += value
+        elif op == '*':
+            factor, delta = factor * value, delta * value
+        else:
+            raise ValueError(f"Unknown effect operator {op!r} for '{key}'.")
+        compiled[slots[key]] = (factor, delta)
+    return tuple((slot, factor, delta) for slot, (factor, delta) in sorted(compiled.items()))
+
+
+def compile_event_list(event_list, slots):
+    """
+    Compiles the effect of every event in an event list exactly once.
+
+    Parameters:
+    - event_list (dict): 'pos.' and 'neg.' lists of events with 'name' and 'effect'.
+    - slots (dict): Mapping of state key to slot index.
+
+    Returns:
+    - dict: 'slot_keys' (the state key of each slot, in slot order) and
+    'effects' (a mapping of event name to its compiled effect).
+    """
+    return {
+        'slot_keys': tuple(slots),
+        'effects': {
+            event['name']: compile_effect(event['effect'], slots)
+            for event_type in ('pos.', 'neg.')
+            for event in event_list.get(event_type, [])
+        }
+    }
+
+
+def _apply_event(event, restaurant_state, compiled_effects):
+    """
+    Applies an event's effect to the restaurant state, using its compiled
+    form when available. Slots are resolved through the keys the effects
+    were compiled against, so the order of the restaurant state's keys does
+    not matter. An event missing from compiled_effects is compiled on the fly.
+
+    Returns:
+    - dict: The change applied to each affected key.
+
+    Raises:
+    - ValueError: If the effect targets a key the restaurant state lacks.
+    """
+    if compiled_effects is None:
+        slot_keys = tuple(restaurant_state)
+        compiled = compile_effect(event['effect'], build_state_slots(slot_keys))
+    else:
+        slot_keys = compiled_effects['slot_keys']
+        compiled = compiled_effects['effects'].get(event['name'])
+        if compiled is None:
+            compiled = compile_effect(event['effect'], build_state_slots(slot_keys))
+
+    applied_changes = {}
+    try:
+        for slot, factor, delta in compiled:
+            key = slot_keys[slot]
+            if factor == 1:
+                restaurant_state[key] += delta
+                applied_changes[key] = delta
+            else:
+                old = restaurant_state[key]
+                restaurant_state[key] = old * factor + delta
+                applied_changes[key] = restaurant_state[key] - old
+    except KeyError as error:
+        raise ValueError(f"Effects were compiled for state keys {slot_keys}, "
+                         f"but the restaurant state has no {error}.") from None
+    return applied_changes
+
+
+def apply_compiled_effect(compiled, slot_keys, state):
+    """
+    Applies a compiled effect to a single restaurant state dict.
+
+    Parameters:
+    - compiled (tuple): Output of compile_effect.
+    - slot_keys (sequence): State key for each slot index.
+    - state (dict): Restaurant state, updated in place.
+
+    Returns:
+    - dict: The change applied to each affected key (new value - old value).
+    """
+    applied_changes = {}
+    for slot, factor, delta in compiled:
+        key = slot_keys[slot]
+        old = state[key]
+        state[key] = old * factor + delta
+        applied_changes[key] = delta if factor == 1 else state[key] - old
+    return applied_changes
+
+
+def states_to_columns(states, slot_keys):
+    """
+    Converts a batch of restaurant state dicts into one column per slot.
+
+    Parameters:
+    - states (list): Restaurant state dicts.
+    - slot_keys (sequence): State key for each slot index.
+
+    Returns:
+    - list: One list of values per slot, indexed by restaurant.
+    """
+    return [[state[key] for state in states] for key in slot_keys]
+
+
+def columns_to_states(columns, slot_keys):
+    """
+    Converts slot columns back into a list of restaurant state dicts.
+
+    Parameters:
+    - columns (list): One list of values per slot (see states_to_columns).
+    - slot_keys (sequence): State key for each slot index.
+
+    Returns:
+    - list: One restaurant state dict per restaurant.
+    """
+    return [dict(zip(slot_keys, values)) for values in zip(*columns)]
+
+
+def apply_effects_batch(event_names, compiled_effects, columns):
+    """
+    Applies one event per restaurant to a whole batch of restaurants.
+
+    The per-restaurant effects are first gathered into factor and delta
+    columns for each touched slot, then every touched column is updated in a
+    single pass. Untouched slots are never visited.
+
+    Parameters:
+    - event_names (list): Event name for each restaurant (None or an unknown
+    name means no effect).
+    - compiled_effects (dict): Output of compile_event_list; its slot_keys
+    give the order of the columns.
+    - columns (list): One list of values per slot, updated in place.
+
+    Returns:
+    - list: The same columns, for convenience.
+    """
+    size = len(event_names)
+    factors = {}
+    deltas = {}
+    for row, name in enumerate(event_names):
+        for slot, factor, delta in compiled_effects['effects'].get(name, ()):
+            if slot not in deltas:
+                factors[slot] = [1] * size
+                deltas[slot] = [0] * size
+            factors[slot][row] = factor
+            deltas[slot][row] = delta
+
+    for slot, slot_deltas in deltas.items():
+        column = columns[slot]
+        column[:] = [value * factor + delta for value, factor, delta
+                     in zip(column, factors[slot], slot_deltas)]
+    return columns
+
+
+def trigger_random_event(probability_positive, event_list, restaurant_state,
+                         compiled_effects=None, rng=random):
     """
     Allie Kang
     Technique Demonstrated - Optional parameters and/or keyword arguments
@@ -189,6 +393,10 @@ def trigger_random_event(probability_positive, event_list, restaurant_state):
                         Each event is a dict with keys: 'name', 'effect'.
     - restaurant_state (dict): current state of the restaurant with keys 
     like 'reputation', 'sales', etc.
+    - compiled_effects (dict, optional): output of compile_event_list for
+    the keys of restaurant_state. Compiled on the fly when omitted.
+    - rng (random.Random, optional): source of randomness; defaults to the
+    random module.
     
     Returns:
     - dict with keys: 'event_name' and 'applied_changes'
@@ -196,17 +404,13 @@ def trigger_random_event(probability_positive, event_list, restaurant_state):
     if not (0 <= probability_positive <= 1):
         raise ValueError("probability_positive must be between 0 and 1.")
     
-    event_type = 'pos.' if random.random() <= probability_positive else 'neg.'
+    event_type = 'pos.' if rng.random() <= probability_positive else 'neg.'
 
     if not event_list[event_type]:
         return {'event_name': "No Event", 'applied_changes': {}}
 
-    event = random.choice(event_list[event_type])
-    applied_changes = {}
-    for key, change in event['effect'].items():
-        if key in restaurant_state:
-            restaurant_state[key] += change
-            applied_changes[key] = change
+    event = rng.choice(event_list[event_type])
+    applied_changes = _apply_event(event, restaurant_state, compiled_effects)
 
     return {
         'event_name': event['name'],
@@ -214,7 +418,7 @@ def trigger_random_event(probability_positive, event_list, restaurant_state):
     }
     
 
-def chain_reaction(event_name, event_list, restaurant_state):
+def chain_reaction(event_name, event_list, restaurant_state, compiled_effects=None):
     """
     Allie Kang
     Technique Demonstrated - Sequence unpacking
@@ -226,6 +430,8 @@ def chain_reaction(event_name, event_list, restaurant_state):
     - event_name (str): the name of the original event.
     - event_list (dict): contains all events.
     - restaurant_state (dict): current state of the restaurant.
+    - compiled_effects (dict, optional): output of compile_event_list for
+    the keys of restaurant_state. Compiled on the fly when omitted.
     
     Returns:
     - dict with keys: 'event_name' and 'applied_changes' (or empty if no chain
@@ -242,11 +448,8 @@ def chain_reaction(event_name, event_list, restaurant_state):
         for event_type in ['pos.', 'neg.']:
             for event in event_list[event_type]:
                 if event['name'] == next_event_name:
-                    applied_changes = {}
-                    for key, change in event['effect'].items():
-                        if key in restaurant_state:
-                            restaurant_state[key] += change
-                            applied_changes[key] = change
+                    applied_changes = _apply_event(event, restaurant_state,
+                                                   compiled_effects)
                     return {
                         'event_name': event['name'],
                         'applied_changes': applied_changes
@@ -278,7 +481,11 @@ def validate_wages(proposed_wages, min_wages):
                 'status': 'Approved'
             }
     return results
-def manage_inventory(inventory, estimated_customers, portion_size=1):
+# Fraction of each ingredient that spoils per day
+SPOILAGE_RATE = 0.05
+
+
+def manage_inventory(inventory, estimated_customers, portion_size=1, spoilage_rate=SPOILAGE_RATE):
     """
     Made by Lawrence
     Updates inventory based on customer demand and spoilage.
@@ -288,18 +495,216 @@ def manage_inventory(inventory, estimated_customers, portion_size=1):
     - inventory (dict): Ingredients and their quantities.
     - estimated_customers (int): Number of customers that day.
     - portion_size (int): Amount of each ingredient used per customer.
+    - spoilage_rate (float): Fraction of each ingredient that spoils per day.
 
     Returns:
     - dict: Updated inventory after usage and spoilage.
     """
-    spoilage_rate = 0.05
-
     updated_inventory = {
         item: max(0, quantity - (estimated_customers * portion_size) - int(quantity * spoilage_rate))
         for item, quantity in inventory.items()
     }
 
     return updated_inventory
+
+
+# Days between placing a supplier order and receiving it
+INGREDIENT_LEAD_TIMES = {
+    'meat': 2,
+    'vegetables': 1,
+    'rice': 3
+}
+
+
+def update_demand_forecast(forecast, observed, alpha=0.3):
+    """
+    Updates an exponentially smoothed demand forecast with one new
+    observation. Each update is O(1) and needs no stored history.
+
+    Parameters:
+    - forecast (float or None): Current forecast, or None before any data.
+    - observed (float): Demand observed today (e.g. estimated_customers).
+    - alpha (float): Smoothing factor between 0 and 1; higher reacts faster.
+
+    Returns:
+    - float: The updated forecast.
+    """
+    return observed if forecast is None else forecast + alpha * (observed - forecast)
+
+
+def update_demand_forecast_batch(forecasts, observed, alpha=0.3):
+    """
+    Batch version of update_demand_forecast over parallel lists.
+
+    Parameters:
+    - forecasts (list): Current forecast per series (None before any data).
+    - observed (list): Demand observed today per series.
+    - alpha (float): Smoothing factor between 0 and 1.
+
+    Returns:
+    - list: The updated forecasts.
+    """
+    return [value if forecast is None else forecast + alpha * (value - forecast)
+            for forecast, value in zip(forecasts, observed)]
+
+
+def plan_reorders_batch(on_hand, on_order, forecasts, lead_times, portion_size=1,
+                        spoilage_rate=SPOILAGE_RATE, safety_days=1):
+    """
+    Computes reorder quantities for many location x ingredient pairs at once.
+
+    Each pair is topped up to the stock needed to cover forecast demand over
+    its lead time plus safety_days, grossed up for spoilage. Stock on hand is
+    assumed to keep spoiling until the order arrives; stock already on order
+    counts in full.
+
+    Parameters:
+    - on_hand (list): Current stock per pair.
+    - on_order (list): Stock already ordered but not yet received per pair.
+    - forecasts (list): Forecast customers per day per pair.
+    - lead_times (list): Lead time in days per pair.
+    - portion_size (int): Amount of each ingredient used per customer.
+    - spoilage_rate (float): Fraction of stock that spoils per day.
+    - safety_days (int): Extra days of demand to keep as safety stock.
+
+    Returns:
+    - list: Whole-unit reorder quantity per pair (0 when no order is needed).
+
+    Raises:
+    - ValueError: If spoilage_rate is not in [0, 1).
+    """
+    if not (0 <= spoilage_rate < 1):
+        raise ValueError("spoilage_rate must be at least 0 and below 1.")
+    keep = 1 - spoilage_rate
+    return [
+        max(0, math.ceil(forecast * portion_size * (lead + safety_days) / keep
+                         - stock * keep ** lead - ordered))
+        for stock, ordered, forecast, lead in zip(on_hand, on_order, forecasts, lead_times)
+    ]
+
+
+def plan_reorders(inventory, forecast, pipeline, lead_times=INGREDIENT_LEAD_TIMES,
+                  portion_size=1, spoilage_rate=SPOILAGE_RATE, safety_days=1):
+    """
+    Computes the reorder quantity for each ingredient of one restaurant.
+
+    Parameters:
+    - inventory (dict): Ingredients and their quantities.
+    - forecast (float): Forecast customers per day (see update_demand_forecast).
+    - pipeline (list): Outstanding orders (see place_orders).
+    - lead_times (dict): Lead time in days per ingredient.
+    - portion_size (int): Amount of each ingredient used per customer.
+    - spoilage_rate (float): Fraction of stock that spoils per day.
+    - safety_days (int): Extra days of demand to keep as safety stock.
+
+    Returns:
+    - dict: Reorder quantity per ingredient.
+    """
+    items = list(inventory)
+    on_order = {item: 0 for item in items}
+    for order in pipeline:
+        if order['item'] in on_order:
+            on_order[order['item']] += order['quantity']
+
+    quantities = plan_reorders_batch(
+        [inventory[item] for item in items],
+        [on_order[item] for item in items],
+        [forecast] * len(items),
+        [lead_times[item] for item in items],
+        portion_size, spoilage_rate, safety_days
+    )
+    return dict(zip(items, quantities))
+
+
+def place_orders(pipeline, orders, day, lead_times=INGREDIENT_LEAD_TIMES):
+    """
+    Adds supplier orders to the pipeline of outstanding orders.
+
+    Parameters:
+    - pipeline (list): Outstanding orders, each a dict with keys 'item',
+    'quantity' and 'arrival_day'.
+    - orders (dict): Quantity to order per ingredient; zeros are skipped.
+    - day (int): The current day.
+    - lead_times (dict): Lead time in days per ingredient.
+
+    Returns:
+    - list: The new pipeline.
+    """
+    return pipeline + [
+        {'item': item, 'quantity': quantity, 'arrival_day': day + lead_times[item]}
+        for item, quantity in orders.items() if quantity > 0
+    ]
+
+
+def receive_orders(inventory, pipeline, day):
+    """
+    Moves every order that has arrived by the given day into the inventory.
+
+    Parameters:
+    - inventory (dict): Ingredients and their quantities.
+    - pipeline (list): Outstanding orders (see place_orders).
+    - day (int): The current day.
+
+    Returns:
+    - tuple: (updated inventory dict, remaining pipeline list)
+    """
+    updated_inventory = dict(inventory)
+    for order in pipeline:
+        if order['arrival_day'] <= day:
+            updated_inventory[order['item']] = updated_inventory.get(order['item'], 0) + order['quantity']
+    return updated_inventory, [order for order in pipeline if order['arrival_day'] > day]
+
+
+def run_inventory_day_batch(on_hand, pipeline, forecasts, customers, lead_times,
+                            portion_size=1, spoilage_rate=SPOILAGE_RATE, safety_days=1,
+                            alpha=0.3):
+    """
+    Runs one day of inventory for many location x ingredient pairs: receives
+    arriving orders, serves the day's customers, updates the demand forecasts
+    and places the new reorders.
+
+    pipeline is a list of arrival buckets: pipeline[d][i] is the quantity
+    arriving at pair i in d + 1 days, so pipeline[0] is received at the start
+    of the next call. It is updated in place and grown as needed to fit the
+    longest lead time.
+
+    Parameters:
+    - on_hand (list): Current stock per pair.
+    - pipeline (list): Arrival buckets (see above); may start empty.
+    - forecasts (list): Current forecast per pair (None before any data).
+    - customers (list): Customers served today per pair.
+    - lead_times (list): Lead time in days (at least 1) per pair.
+    - portion_size, spoilage_rate, safety_days: see plan_reorders_batch.
+    - alpha (float): Smoothing factor for the demand forecast.
+
+    Returns:
+    - tuple: (on_hand list, forecasts list, orders list) after the day.
+
+    Raises:
+    - ValueError: If any lead time is below 1.
+    """
+    if any(lead < 1 for lead in lead_times):
+        raise ValueError("lead_times must all be at least 1 day.")
+    size = len(on_hand)
+    if pipeline:
+        arrivals = pipeline.pop(0)
+        on_hand = [stock + arriving for stock, arriving in zip(on_hand, arrivals)]
+
+    on_hand = [max(0, stock - served * portion_size - int(stock * spoilage_rate))
+               for stock, served in zip(on_hand, customers)]
+    forecasts = update_demand_forecast_batch(forecasts, customers, alpha)
+
+    on_order = [sum(bucket) for bucket in zip(*pipeline)] if pipeline else [0] * size
+    orders = plan_reorders_batch(on_hand, on_order, forecasts, lead_times,
+                                 portion_size, spoilage_rate, safety_days)
+
+    while len(pipeline) < max(lead_times, default=0):
+        pipeline.append([0] * size)
+    for pair, (quantity, lead) in enumerate(zip(orders, lead_times)):
+        if quantity:
+            pipeline[lead - 1][pair] += quantity
+
+    return on_hand, forecasts, orders
 """
 Abel Degnet
 Revenue Algorithm Simulation
@@ -322,56 +727,116 @@ Execution:
 # Income and expense history
 profit_history = []
 
-def simulate_day():
+# Income and expense breakdown of an ordinary day
+DAY_INCOME = {
+    'food_sales': 1200,
+    'drink_sales': 450,
+    'promotions': 200,
+    'delivery': 350
+}
+
+DAY_EXPENSES = {
+    'wages': 800,
+    'food_costs': 300,
+    'maintenance': 100,
+    'utilities': 150,
+    'marketing': 75
+}
+
+# Daily events and their effect on the income/expense lines
+DAY_EVENTS = {
+    'none': {},
+    'bad_review': {'food_sales': ('*', 0.9)},
+    'promo_success': {'promotions': 150},
+    'utility_surge': {'utilities': 50}
+}
+
+DAY_EVENT_NAMES = list(DAY_EVENTS)
+DAY_SLOT_KEYS = tuple(DAY_INCOME) + tuple(DAY_EXPENSES)
+DAY_SLOTS = build_state_slots(DAY_SLOT_KEYS)
+DAY_LINES = tuple(DAY_INCOME.values()) + tuple(DAY_EXPENSES.values())
+COMPILED_DAY_EVENTS = {
+    'slot_keys': DAY_SLOT_KEYS,
+    'effects': {event: compile_effect(effect, DAY_SLOTS) for event, effect in DAY_EVENTS.items()}
+}
+
+def simulate_day(rng=random, history=None, wages=None):
     """
     Simulates a single day of restaurant operations.
     Calculates income and expenses, applies a random event,
     and returns the daily profit with event context.
 
+    Args:
+        rng (random.Random, optional): Source of randomness for the event.
+        history (list, optional): Where to store the result; defaults to
+            profit_history.
+        wages (float, optional): Wage expense for the day; defaults to the
+            fixed wage line in DAY_EXPENSES.
+
     Returns:
         dict: Contains event, total income, total expenses, and daily profit.
     """
-    # Income breakdown
-    income = {
-        'food_sales': 1200,
-        'drink_sales': 450,
-        'promotions': 200,
-        'delivery': 350
-    }
-
-    # Expense breakdown
-    expenses = {
-        'wages': 800,
-        'food_costs': 300,
-        'maintenance': 100,
-        'utilities': 150,
-        'marketing': 75
-    }
+    if history is None:
+        history = profit_history
+    # Income lines followed by expense lines, in slot order
+    day_lines = list(DAY_LINES)
+    if wages is not None:
+        day_lines[DAY_SLOTS['wages']] = wages
 
     # Simulate random event
-    event = random.choice(['none', 'bad_review', 'promo_success', 
-                           'utility_surge'])
-
-    if event == 'bad_review':
-        income['food_sales'] *= 0.9  
-    elif event == 'promo_success':
-        income['promotions'] += 150
-    elif event == 'utility_surge':
-        expenses['utilities'] += 50
-
-    total_income = sum(income.values())
-    total_expenses = sum(expenses.values())
+    event = rng.choice(DAY_EVENT_NAMES)
+    for slot, factor, delta in COMPILED_DAY_EVENTS['effects'][event]:
+        day_lines[slot] = day_lines[slot] * factor + delta
+
+    total_income = sum(day_lines[:len(DAY_INCOME)])
+    total_expenses = sum(day_lines[len(DAY_INCOME):])
     daily_profit = total_income - total_expenses
 
     # Store the result
-    profit_history.append({
+    history.append({
         'event': event,
         'total_income': total_income,
         'total_expenses': total_expenses,
         'daily_profit': daily_profit
     })
 
-    return profit_history[-1]
+    return history[-1]
+
+
+def simulate_day_batch(num_restaurants, rng=random, wages=None):
+    """
+    Simulates one day for a whole batch of restaurants at once. Each
+    restaurant draws its own daily event, and all the effects are applied
+    with apply_effects_batch. The results are not added to profit_history.
+
+    Parameters:
+    - num_restaurants (int): Number of restaurants to simulate.
+    - rng (random.Random, optional): Source of randomness for the events.
+    - wages (float, optional): Wage expense per restaurant; defaults to the
+    fixed wage line in DAY_EXPENSES.
+
+    Returns:
+    - list: One dict per restaurant with the same keys as simulate_day().
+    """
+    day_lines = {**DAY_INCOME, **DAY_EXPENSES}
+    if wages is not None:
+        day_lines['wages'] = wages
+    columns = [[value] * num_restaurants for value in day_lines.values()]
+    events = [rng.choice(DAY_EVENT_NAMES) for _ in range(num_restaurants)]
+    apply_effects_batch(events, COMPILED_DAY_EVENTS, columns)
+
+    income_columns = [columns[DAY_SLOTS[key]] for key in DAY_INCOME]
+    expense_columns = [columns[DAY_SLOTS[key]] for key in DAY_EXPENSES]
+    results = []
+    for event, total_income, total_expenses in zip(
+            events, map(sum, zip(*income_columns)), map(sum, zip(*expense_columns))):
+        results.append({
+            'event': event,
+            'total_income': total_income,
+            'total_expenses': total_expenses,
+            'daily_profit': total_income - total_expenses
+        })
+    return results
 # === Game Setup ===
 
 restaurant_state = {
@@ -418,95 +883,1244 @@ min_wages = {
     'Dishwasher': 9.0
 }
 
+# Settings used by play_day; copy and override them for experiments
+GAME_CONFIG = {
+    'base_cost': 5,
+    'customer_sensitivity': 1.5,
+    'probability_positive': 0.5,
+    'metric_weights': None,
+    'min_wages': min_wages,
+    # Hours paid per role per day; None keeps the fixed wage line of simulate_day
+    'shift_hours': None
+}
+
+STARTING_INVENTORY = {
+    'meat': 300,
+    'vegetables': 200,
+    'rice': 150
+}
+
 # === Game Loop ===
 
-def main_game():
-    base_cost = 5
-    day = 1
-    total_profit = 0
+def new_game(seed=None, config=None):
+    """
+    Creates the state of a fresh game. Everything that changes from day to
+    day lives in the returned dict, so games can run side by side.
+
+    Parameters:
+    - seed (int, optional): Seed for the game's random events; None picks one
+    at random.
+    - config (dict, optional): Overrides for GAME_CONFIG.
 
-    # Inventory initialization
-    inventory = {
-        'meat': 300,
-        'vegetables': 200,
-        'rice': 150
+    Returns:
+    - dict: The game state, passed to play_day.
+    """
+    return {
+        'day': 1,
+        'total_profit': 0,
+        'restaurant_state': dict(restaurant_state),
+        'inventory': dict(STARTING_INVENTORY),
+        'demand_forecast': None,
+        'pipeline': [],
+        'profit_history': [],
+        'rng': random.Random(seed),
+        'config': {**GAME_CONFIG, **(config or {})},
+        # Event effects are compiled once against the restaurant state slots
+        'compiled_events': compile_event_list(event_list, build_state_slots(restaurant_state))
     }
 
-    print("Welcome to Restaurant Tycoon!\n")
 
-    while True:
-        print(f"\n--- Day {day} ---")
+def calculate_wage_bill(wage_results, min_wages, shift_hours):
+    """
+    Computes the day's wage expense. Rejected wages are paid at the legal
+    minimum instead, so underpaying never lowers the bill.
+
+    Parameters:
+    - wage_results (dict): Output of validate_wages.
+    - min_wages (dict): Legal minimum wage per role.
+    - shift_hours (float): Hours paid per role per day.
 
+    Returns:
+    - float: Total wages for the day.
+    """
+    return sum(
+        max(result['proposed_wage'], min_wages.get(role, 0)) * shift_hours
+        for role, result in wage_results.items()
+    )
+
+
+def start_day(game, decision):
+    """
+    Plays the first half of a day: menu pricing, inventory and reorders,
+    and satisfaction. Only the 'price', 'staff_efficiency', 'cleanliness'
+    and 'wait_time' keys of the decision are used, so the results can be
+    shown before the player proposes wages.
+
+    Parameters:
+    - game (dict): Game state from new_game, updated in place.
+    - decision (dict): The player's choices for the day (see play_day).
+
+    Returns:
+    - dict: The first half of the day's report, completed by finish_day.
+    """
+    config = game['config']
+    day = game['day']
+
+    # Menu Evaluation
+    menu_result = evaluate_menu_price(decision['price'], config['base_cost'],
+                                      config['customer_sensitivity'])
+    game['total_profit'] += menu_result["total_profit"]
+    customers = menu_result["estimated_customers"]
+
+    # Inventory Update
+    inventory, pipeline = receive_orders(game['inventory'], game['pipeline'], day)
+    inventory = manage_inventory(inventory, customers)
+
+    # Supplier Reorders
+    game['demand_forecast'] = update_demand_forecast(game['demand_forecast'], customers)
+    orders = plan_reorders(inventory, game['demand_forecast'], pipeline)
+    game['pipeline'] = place_orders(pipeline, orders, day)
+    game['inventory'] = inventory
+
+    # Satisfaction Score
+    satisfaction_score = calculate_satisfaction(decision['staff_efficiency'],
+                                                decision['cleanliness'],
+                                                decision['wait_time'],
+                                                config['metric_weights'])
+
+    return {
+        'day': day,
+        'menu_result': menu_result,
+        'inventory': dict(inventory),
+        'orders': orders,
+        'satisfaction_score': satisfaction_score
+    }
+
+
+def finish_day(game, report, decision):
+    """
+    Plays the second half of a day started with start_day: wages, random
+    events and the revenue simulation.
+
+    Parameters:
+    - game (dict): Game state from new_game, updated in place.
+    - report (dict): Output of start_day for the same day, updated in place.
+    - decision (dict): The player's choices for the day; only 'wages' is used.
+
+    Returns:
+    - dict: The completed report (see play_day).
+    """
+    config = game['config']
+    state = game['restaurant_state']
+
+    # Wages
+    wage_results = validate_wages(decision['wages'], config['min_wages'])
+    wages = (None if config['shift_hours'] is None else
+             calculate_wage_bill(wage_results, config['min_wages'], config['shift_hours']))
+
+    # Random Event and Chain Reaction
+    event_result = trigger_random_event(config['probability_positive'], event_list, state,
+                                        compiled_effects=game['compiled_events'],
+                                        rng=game['rng'])
+    state_after_event = dict(state)
+    chain_result = chain_reaction(event_result['event_name'], event_list, state,
+                                  compiled_effects=game['compiled_events'])
+
+    # Revenue Simulation
+    daily_report = simulate_day(rng=game['rng'], history=game['profit_history'], wages=wages)
+
+    game['day'] += 1
+    report.update({
+        'wage_results': wage_results,
+        'event_result': event_result,
+        'state_after_event': state_after_event,
+        'chain_result': chain_result,
+        'state_after_chain': dict(state),
+        'daily_report': daily_report
+    })
+    return report
+
+
+def play_day(game, decision):
+    """
+    Plays one day of the game headlessly: menu pricing, inventory and
+    reorders, satisfaction, wages, random events and the revenue simulation.
+
+    Parameters:
+    - game (dict): Game state from new_game, updated in place.
+    - decision (dict): The player's choices for the day, with keys 'price',
+    'staff_efficiency', 'cleanliness', 'wait_time' and 'wages' (a mapping of
+    role to proposed hourly wage).
+
+    Returns:
+    - dict: Everything that happened during the day, for display or analysis.
+    """
+    return finish_day(game, start_day(game, decision), decision)
+
+
+def read_decision():
+    """
+    Prompts the player for the first part of one day's decisions.
+
+    Returns:
+    - dict: The decision without 'wages' (see read_wages), or None if the
+    numbers were invalid.
+    """
+    try:
+        price = float(input("Set your menu price: $"))
+        staff_eff = float(input("Staff efficiency (0-100): "))
+        cleanliness = float(input("Cleanliness (0-100): "))
+        wait_time = float(input("Average wait time (minutes): "))
+    except ValueError:
+        print("Invalid input. Please enter numbers.")
+        return None
+
+    return {
+        'price': price,
+        'staff_efficiency': staff_eff,
+        'cleanliness': cleanliness,
+        'wait_time': wait_time
+    }
+
+
+def read_wages():
+    """
+    Prompts the player for the proposed wage of every role.
+
+    Returns:
+    - dict: Mapping of role to proposed hourly wage; invalid entries are $0.
+    """
+    print("\nEnter proposed wages:")
+    proposed = {}
+    for role in min_wages:
         try:
-            price = float(input("Set your menu price: $"))
-            staff_eff = float(input("Staff efficiency (0-100): "))
-            cleanliness = float(input("Cleanliness (0-100): "))
-            wait_time = float(input("Average wait time (minutes): "))
+            wage = float(input(f"  {role} wage: $"))
+            proposed[role] = wage
         except ValueError:
-            print("Invalid input. Please enter numbers.")
-            continue
+            print("Invalid wage. Setting to $0.")
+            proposed[role] = 0.0
+    return proposed
+
+
+def print_service_report(report):
+    """
+    Prints the first half of a day's outcome, as returned by start_day.
+    """
+    menu_result = report['menu_result']
+    print("-> Menu Profit:", menu_result["total_profit"])
+    print("-> Customer Satisfaction (from price):", menu_result["customer_satisfaction"])
+    print("-> Inventory after service:", report['inventory'])
+    print("-> Reorders placed:", {item: qty for item, qty in report['orders'].items() if qty > 0})
+    print("-> Customer Satisfaction (overall):", report['satisfaction_score'])
+
 
-        # Menu Evaluation
-        menu_result = evaluate_menu_price(price, base_cost)
-        print("-> Menu Profit:", menu_result["total_profit"])
-        print("-> Customer Satisfaction (from price):", menu_result["customer_satisfaction"])
-        total_profit += menu_result["total_profit"]
-
-        # Inventory Update
-        inventory = manage_inventory(inventory, menu_result["estimated_customers"])
-        print("-> Inventory after service:", inventory)
-
-        # Satisfaction Score
-        satisfaction_score = calculate_satisfaction(staff_eff, cleanliness, wait_time)
-        print("-> Customer Satisfaction (overall):", satisfaction_score)
-
-        # Wages
-        print("\nEnter proposed wages:")
-        proposed = {}
-        for role in min_wages:
-            try:
-                wage = float(input(f"  {role} wage: $"))
-                proposed[role] = wage
-            except ValueError:
-                print("Invalid wage. Setting to $0.")
-                proposed[role] = 0.0
-        wage_results = validate_wages(proposed, min_wages)
-        for role, result in wage_results.items():
-            print(f"  {role} - {result['status']}", f"({result.get('reason','')})")
-
-        # Random Event
-        event_result = trigger_random_event(0.5, event_list, restaurant_state)
-        print(f"\nRandom Event: {event_result['event_name']}")
-        for k, v in event_result['applied_changes'].items():
+def print_events_report(report):
+    """
+    Prints the second half of a day's outcome, as returned by finish_day.
+    """
+    for role, result in report['wage_results'].items():
+        print(f"  {role} - {result['status']}", f"({result.get('reason','')})")
+
+    event_result = report['event_result']
+    print(f"\nRandom Event: {event_result['event_name']}")
+    for k, v in event_result['applied_changes'].items():
+        print(f"  {k} changed by {v}")
+    print("Current Reputation:", report['state_after_event']['reputation'])
+    print("Current Sales: $", report['state_after_event']['sales'])
+
+    chain_result = report['chain_result']
+    if chain_result['event_name'] != "No Chain Reaction":
+        print(f"Chain Reaction Event: {chain_result['event_name']}")
+        for k, v in chain_result['applied_changes'].items():
             print(f"  {k} changed by {v}")
+        print("Updated Reputation:", report['state_after_chain']['reputation'])
+        print("Updated Sales: $", report['state_after_chain']['sales'])
+
+    daily_report = report['daily_report']
+    print("\n--- Revenue Simulation ---")
+    print(f"  Event: {daily_report['event']}")
+    print(f"  Total Income: ${daily_report['total_income']}")
+    print(f"  Total Expenses: ${daily_report['total_expenses']}")
+    print(f"  Daily Profit: ${daily_report['daily_profit']}")
+
+
+def main_game(seed=None, record_path=None):
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    game = new_game(seed)
+    session = new_session(seed)
+
+    print("Welcome to Restaurant Tycoon!\n")
+
+    while True:
+        print(f"\n--- Day {game['day']} ---")
 
-        print("Current Reputation:", restaurant_state['reputation'])
-        print("Current Sales: $", restaurant_state['sales'])
-
-        # Chain Reaction
-        chain_result = chain_reaction(event_result['event_name'], event_list, restaurant_state)
-        if chain_result['event_name'] != "No Chain Reaction":
-            print(f"Chain Reaction Event: {chain_result['event_name']}")
-            for k, v in chain_result['applied_changes'].items():
-                print(f"  {k} changed by {v}")
-            print("Updated Reputation:", restaurant_state['reputation'])
-            print("Updated Sales: $", restaurant_state['sales'])
-
-        # Revenue Simulation
-        print("\n--- Revenue Simulation ---")
-        daily_report = simulate_day()
-        print(f"  Event: {daily_report['event']}")
-        print(f"  Total Income: ${daily_report['total_income']}")
-        print(f"  Total Expenses: ${daily_report['total_expenses']}")
-        print(f"  Daily Profit: ${daily_report['daily_profit']}")
+        decision = read_decision()
+        if decision is None:
+            continue
+
+        report = start_day(game, decision)
+        print_service_report(report)
+
+        decision['wages'] = read_wages()
+        finish_day(game, report, decision)
+        print_events_report(report)
+
+        session['decisions'].append(decision)
+        if record_path:
+            save_session(session, record_path)
 
         # Continue?
         cont = input("\nNext day? (y/n): ").strip().lower()
         if cont != 'y':
             break
-        day += 1
 
-    print(f"\nThanks for playing! Total Profit: ${total_profit:.2f}")
+    print(f"\nThanks for playing! Total Profit: ${game['total_profit']:.2f}")
+
+# === Batch Consistency Checks ===
+
+def check_batch_paths(seed=0, restaurants=20):
+    """
+    Runs the batch versions of the event effects, the revenue simulation
+    and the inventory side by side with the single-restaurant versions on the same random inputs and reports any
+    result that differs, so the two paths cannot drift apart unnoticed.
+
+    Parameters:
+    - seed (int): Seed for the random inputs.
+    - restaurants (int): Number of restaurants in the batch.
+
+    Returns:
+    - list: A description of every mismatch; empty when all paths agree.
+    """
+    rng = random.Random(seed)
+    mismatches = []
+
+    # Event effects: apply_effects_batch vs apply_compiled_effect
+    compiled_events = compile_event_list(event_list, build_state_slots(restaurant_state))
+    slot_keys = compiled_events['slot_keys']
+    names = [event['name'] for event_type in ('pos.', 'neg.') for event in event_list[event_type]]
+    states = [{key: rng.randint(0, 20000) for key in slot_keys} for _ in range(restaurants)]
+    chosen = [rng.choice(names + [None]) for _ in range(restaurants)]
+    columns = apply_effects_batch(chosen, compiled_events, states_to_columns(states, slot_keys))
+    for row, (state, name) in enumerate(zip(states, chosen)):
+        if name is not None:
+            apply_compiled_effect(compiled_events['effects'][name], slot_keys, state)
+        if columns_to_states(columns, slot_keys)[row] != state:
+            mismatches.append(f"event effects differ for restaurant {row} ({name})")
+
+    # Revenue simulation: simulate_day_batch vs simulate_day on the same draws
+    day_seed = rng.randrange(2 ** 32)
+    for wages in (None, 500):
+        batch_days = simulate_day_batch(restaurants, random.Random(day_seed), wages)
+        single_rng = random.Random(day_seed)
+        single_days = [simulate_day(single_rng, [], wages) for _ in range(restaurants)]
+        if batch_days != single_days:
+            mismatches.append(f"revenue simulation differs (wages={wages})")
+
+    # Inventory: run_inventory_day_batch vs the per-restaurant dict functions,
+    # one batch pair per restaurant x ingredient
+    items = list(STARTING_INVENTORY)
+    inventories = [dict(STARTING_INVENTORY) for _ in range(restaurants)]
+    pipelines = [[] for _ in range(restaurants)]
+    forecasts = [None] * restaurants
+    on_hand = [STARTING_INVENTORY[item] for _ in range(restaurants) for item in items]
+    buckets = []
+    batch_forecasts = [None] * len(on_hand)
+    lead_times = [INGREDIENT_LEAD_TIMES[item] for _ in range(restaurants) for item in items]
+    for day in range(1, 31):
+        customers = [rng.randint(0, 80) for _ in range(restaurants)]
+        on_hand, batch_forecasts, batch_orders = run_inventory_day_batch(
+            on_hand, buckets, batch_forecasts,
+            [served for served in customers for _ in items], lead_times)
+        for row, served in enumerate(customers):
+            inventory, pipelines[row] = receive_orders(inventories[row], pipelines[row], day)
+            inventories[row] = manage_inventory(inventory, served)
+            forecasts[row] = update_demand_forecast(forecasts[row], served)
+            orders = plan_reorders(inventories[row], forecasts[row], pipelines[row])
+            pipelines[row] = place_orders(pipelines[row], orders, day)
+
+            pairs = slice(row * len(items), (row + 1) * len(items))
+            if (on_hand[pairs] != [inventories[row][item] for item in items]
+                    or batch_orders[pairs] != [orders[item] for item in items]
+                    or batch_forecasts[pairs] != [forecasts[row]] * len(items)):
+                mismatches.append(f"inventory differs for restaurant {row} on day {day}")
+
+    return mismatches
+
+
+# === Session Replay ===
+
+def new_session(seed, config=None):
+    """
+    Starts an empty recording of a game session. Together with the seed, the
+    recorded decisions are enough to replay the game exactly.
+
+    Parameters:
+    - seed (int): The seed the game was created with.
+    - config (dict, optional): The config overrides the game was created with.
+
+    Returns:
+    - dict: Session with keys 'seed', 'config' and 'decisions'.
+    """
+    return {'seed': seed, 'config': config or {}, 'decisions': []}
+
+
+def save_session(session, file_path):
+    """
+    Writes a recorded session to a JSON file.
+
+    Side effects:
+    - Creates or overwrites file_path.
+    """
+    with open(file_path, 'w') as f:
+        f.write(json.dumps(session, indent=2))
+
+
+def load_session(file_path):
+    """
+    Reads a recorded session from a JSON file.
+
+    Raises:
+    - FileNotFoundError: If the file at file_path does not exist.
+    """
+    with open(file_path, 'r') as f:
+        return json.load(f)
+
+
+def replay_session(session):
+    """
+    Re-plays a recorded session headlessly.
+
+    Parameters:
+    - session (dict): A recorded session (see new_session).
+
+    Returns:
+    - tuple: (final game state, list of play_day reports)
+    """
+    game = new_game(session['seed'], session['config'])
+    reports = [play_day(game, decision) for decision in session['decisions']]
+    return game, reports
+
+
+def snapshot_game(game):
+    """
+    Captures the parts of a game state that change from day to day. The
+    profit history is left out; it only grows, so a prefix of the recorded
+    history stands in for it (see restore_game).
+
+    Parameters:
+    - game (dict): Game state from new_game.
+
+    Returns:
+    - dict: The snapshot.
+    """
+    return {
+        'day': game['day'],
+        'total_profit': game['total_profit'],
+        'restaurant_state': dict(game['restaurant_state']),
+        'inventory': dict(game['inventory']),
+        # play_day replaces the pipeline list and never changes its orders
+        'pipeline': game['pipeline'],
+        'demand_forecast': game['demand_forecast'],
+        'rng_state': game['rng'].getstate()
+    }
+
+
+def restore_game(session, snapshot, profit_history):
+    """
+    Rebuilds a game state from a snapshot taken by snapshot_game.
+
+    Parameters:
+    - session (dict): The session the snapshot was taken from.
+    - snapshot (dict): Output of snapshot_game.
+    - profit_history (list): The recorded profit history; the days before
+    the snapshot are copied into the restored game.
+
+    Returns:
+    - dict: A game state ready for play_day.
+    """
+    game = new_game(session['seed'], session['config'])
+    game.update({
+        'day': snapshot['day'],
+        'total_profit': snapshot['total_profit'],
+        'restaurant_state': dict(snapshot['restaurant_state']),
+        'inventory': dict(snapshot['inventory']),
+        'pipeline': snapshot['pipeline'],
+        'demand_forecast': snapshot['demand_forecast'],
+        'profit_history': profit_history[:snapshot['day'] - 1]
+    })
+    game['rng'].setstate(snapshot['rng_state'])
+    return game
+
+
+def build_replay_cache(session):
+    """
+    Re-plays a recorded session and keeps a snapshot of the game state at
+    the start of every day, so what_if can resume from any day without
+    re-playing the days before it. Each snapshot holds only the state that
+    changes from day to day, so the cache grows linearly with the session.
+
+    Parameters:
+    - session (dict): A recorded session (see new_session).
+
+    Returns:
+    - dict: The session, the per-day 'snapshots' (snapshots[0] is the start
+    of day 1), the recorded 'profit_history' and the 'total_profit' of the
+    recorded game.
+    """
+    game = new_game(session['seed'], session['config'])
+    snapshots = []
+    for decision in session['decisions']:
+        snapshots.append(snapshot_game(game))
+        play_day(game, decision)
+    return {
+        'session': session,
+        'snapshots': snapshots,
+        'profit_history': game['profit_history'],
+        'total_profit': game['total_profit']
+    }
+
+
+def what_if(cache, day, changes):
+    """
+    Answers "what if I had decided differently on this day?". The game
+    resumes from the cached snapshot at the start of that day, so only the
+    days from the changed one onward are re-played. Later decisions are kept
+    as recorded, and random events follow the recorded seed.
+
+    Parameters:
+    - cache (dict): Output of build_replay_cache.
+    - day (int): The day whose decision changes (1 is the first day).
+    - changes (dict): Decision fields to override, e.g. {'price': 11}. A
+    'wages' entry only overrides the roles it names.
+
+    Returns:
+    - dict: The changed decision, 'total_profit' of the alternative game,
+    'recorded_total_profit', their 'difference' and the re-played 'reports'.
+
+    Raises:
+    - ValueError: If the day was not recorded.
+    """
+    decisions = cache['session']['decisions']
+    if not 1 <= day <= len(decisions):
+        raise ValueError(f"day must be between 1 and {len(decisions)}.")
+
+    decision = {**decisions[day - 1], **changes}
+    decision['wages'] = {**decisions[day - 1]['wages'], **changes.get('wages', {})}
+
+    game = restore_game(cache['session'], cache['snapshots'][day - 1], cache['profit_history'])
+    reports = [play_day(game, decision)]
+    reports += [play_day(game, later) for later in decisions[day:]]
+    return {
+        'day': day,
+        'decision': decision,
+        'total_profit': round(game['total_profit'], 2),
+        'recorded_total_profit': round(cache['total_profit'], 2),
+        'difference': round(game['total_profit'] - cache['total_profit'], 2),
+        'reports': reports
+    }
+
+
+def parse_changes(assignments, roles=None):
+    """
+    Parses command-line changes such as ["price=11", "Chef=15"] into a
+    changes dict for what_if. Each name must be a decision field or a wage
+    role.
+
+    Parameters:
+    - assignments (list): NAME=NUMBER strings.
+    - roles (iterable, optional): Known wage roles; defaults to the keys of
+    min_wages.
+
+    Raises:
+    - ValueError: If an assignment is not NAME=NUMBER, or NAME is neither a
+    decision field nor a wage role.
+    """
+    roles = set(min_wages if roles is None else roles)
+    changes = {}
+    for assignment in assignments:
+        name, _, value = assignment.partition('=')
+        if not value:
+            raise ValueError(f"Expected NAME=NUMBER, got '{assignment}'.")
+        if name in ('price', 'staff_efficiency', 'cleanliness', 'wait_time'):
+            changes[name] = float(value)
+        elif name in roles:
+            changes.setdefault('wages', {})[name] = float(value)
+        else:
+            raise ValueError(f"Unknown decision field or wage role: '{name}'.")
+    return changes
+
+
+# === Live Metrics ===
+
+# Decision used on every day of a headless run unless another is given
+HEADLESS_DECISION = {
+    'price': 9.5,
+    'staff_efficiency': 80,
+    'cleanliness': 80,
+    'wait_time': 10,
+    'wages': {'Chef': 14.0, 'Waiter': 12.5, 'Dishwasher': 9.5}
+}
+
+
+def new_metrics(window=100):
+    """
+    Creates an empty in-process metrics registry with counters, gauges and
+    rolling windows. Every update takes the registry's lock, so it is safe
+    to export the metrics from another thread while a run is in progress.
+
+    Parameters:
+    - window (int): Number of most recent observations each rolling window keeps.
+
+    Returns:
+    - dict: The registry, passed to the other metrics functions.
+    """
+    return {
+        'counters': {},
+        'gauges': {},
+        'windows': {},
+        'window': window,
+        'started': time.time(),
+        'lock': threading.Lock()
+    }
+
+
+def _metric_key(name, labels):
+    return (name, tuple(sorted(labels.items())) if labels else ())
+
+
+def _inc(metrics, name, amount=1, labels=None):
+    key = _metric_key(name, labels)
+    metrics['counters'][key] = metrics['counters'].get(key, 0) + amount
+
+
+def _set(metrics, name, value, labels=None):
+    metrics['gauges'][_metric_key(name, labels)] = value
+
+
+def _observe(metrics, name, value, labels=None):
+    key = _metric_key(name, labels)
+    if key not in metrics['windows']:
+        metrics['windows'][key] = deque(maxlen=metrics['window'])
+    metrics['windows'][key].append(value)
+
+
+def inc_counter(metrics, name, amount=1, labels=None):
+    """
+    Adds amount to a counter, creating it at 0 if needed.
+    """
+    with metrics['lock']:
+        _inc(metrics, name, amount, labels)
+
+
+def set_gauge(metrics, name, value, labels=None):
+    """
+    Sets a gauge to its current value.
+    """
+    with metrics['lock']:
+        _set(metrics, name, value, labels)
+
+
+def observe(metrics, name, value, labels=None):
+    """
+    Adds a value to a rolling window that keeps the most recent observations.
+    """
+    with metrics['lock']:
+        _observe(metrics, name, value, labels)
+
+
+def record_day_metrics(metrics, report, game, duration=None):
+    """
+    Updates the metrics registry from one play_day report. The lock is taken
+    once for the whole day to keep the overhead per day small.
+
+    Parameters:
+    - metrics (dict): Registry from new_metrics.
+    - report (dict): Output of play_day.
+    - game (dict): The game state the day was played on.
+    - duration (float, optional): Seconds the day took, for throughput.
+    """
+    state = report['state_after_chain']
+    rejected = sum(1 for result in report['wage_results'].values()
+                   if result['status'] == 'Rejected')
+
+    with metrics['lock']:
+        _inc(metrics, 'restaurant_days_total')
+        _set(metrics, 'restaurant_day', report['day'])
+        _set(metrics, 'restaurant_total_profit', game['total_profit'])
+        _set(metrics, 'restaurant_reputation', state['reputation'])
+        _set(metrics, 'restaurant_sales', state['sales'])
+        _observe(metrics, 'restaurant_daily_profit', report['daily_report']['daily_profit'])
+        _observe(metrics, 'restaurant_menu_profit', report['menu_result']['total_profit'])
+        _observe(metrics, 'restaurant_reputation', state['reputation'])
+        _observe(metrics, 'restaurant_sales', state['sales'])
+        _observe(metrics, 'restaurant_wage_rejection_rate',
+                 rejected / len(report['wage_results']) if report['wage_results'] else 0)
+        _inc(metrics, 'restaurant_wage_decisions_total',
+             len(report['wage_results']) - rejected, {'status': 'Approved'})
+        _inc(metrics, 'restaurant_wage_decisions_total', rejected, {'status': 'Rejected'})
+        for item, quantity in report['inventory'].items():
+            _set(metrics, 'restaurant_inventory', quantity, {'item': item})
+            _inc(metrics, 'restaurant_stockouts_total', 1 if quantity == 0 else 0, {'item': item})
+        if duration is not None:
+            _observe(metrics, 'restaurant_day_duration_seconds', duration)
+
+
+def _format_sample(name, labels, value):
+    label_text = ','.join(f'{key}="{label}"' for key, label in labels)
+    return f"{name}{{{label_text}}} {value}" if labels else f"{name} {value}"
+
+
+def metrics_snapshot(metrics):
+    """
+    Summarizes the registry as plain numbers. Rolling windows become their
+    mean, min and max, and the rolling throughput is reported in days/sec.
+
+    Everything is read while holding the registry's lock, so it is safe to
+    call while another thread records days.
+
+    Returns:
+    - list: (name, labels tuple, value, type) samples, where type is
+    'counter' or 'gauge'.
+    """
+    with metrics['lock']:
+        samples = [(name, labels, value, 'counter')
+                   for (name, labels), value in metrics['counters'].items()]
+        samples += [(name, labels, value, 'gauge')
+                    for (name, labels), value in metrics['gauges'].items()]
+        for (name, labels), values in metrics['windows'].items():
+            if values:
+                samples.append((f"{name}_rolling_mean", labels, sum(values) / len(values), 'gauge'))
+                samples.append((f"{name}_rolling_min", labels, min(values), 'gauge'))
+                samples.append((f"{name}_rolling_max", labels, max(values), 'gauge'))
+        durations = metrics['windows'].get(('restaurant_day_duration_seconds', ()))
+        if durations and sum(durations) > 0:
+            samples.append(('restaurant_days_per_second', (),
+                            len(durations) / sum(durations), 'gauge'))
+    samples.append(('restaurant_uptime_seconds', (), time.time() - metrics['started'], 'gauge'))
+    return samples
+
+
+def format_prometheus(metrics):
+    """
+    Formats the registry in the Prometheus text exposition format.
+
+    Returns:
+    - str: One '# TYPE' line per metric followed by its samples.
+    """
+    lines = []
+    typed = set()
+    for name, labels, value, kind in metrics_snapshot(metrics):
+        if name not in typed:
+            lines.append(f"# TYPE {name} {kind}")
+            typed.add(name)
+        lines.append(_format_sample(name, labels, value))
+    return '\n'.join(lines) + '\n'
+
+
+def write_metrics_snapshot(metrics, file_path):
+    """
+    Writes the current metrics to a JSON file, replacing it atomically so
+    readers never see a half-written snapshot.
+
+    Side effects:
+    - Creates or overwrites file_path.
+    """
+    snapshot = {
+        'time': time.time(),
+        'metrics': [
+            {'name': name, 'labels': dict(labels), 'value': value, 'type': kind}
+            for name, labels, value, kind in metrics_snapshot(metrics)
+        ]
+    }
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write(json.dumps(snapshot, indent=2))
+    os.replace(temp_path, file_path)
+
+
+def serve_metrics(metrics, port=9100, host='127.0.0.1'):
+    """
+    Serves the registry at http://host:port/metrics in Prometheus text
+    format, from a background thread.
+
+    Parameters:
+    - metrics (dict): Registry from new_metrics.
+    - port (int): Port to listen on; 0 picks a free one.
+    - host (str): Interface to listen on; local only by default.
+
+    Returns:
+    - ThreadingHTTPServer: The running server; call shutdown() to stop it.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = format_prometheus(metrics).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_headless(days, decision=None, seed=None, metrics=None, snapshot_path=None,
+                 snapshot_interval=5.0, history_limit=1000):
+    """
+    Plays many days without any prompts, updating the metrics after each day.
+
+    Parameters:
+    - days (int): Number of days to play.
+    - decision (dict, optional): Decision used every day; defaults to
+    HEADLESS_DECISION.
+    - seed (int, optional): Seed for the game's random events.
+    - metrics (dict, optional): Registry from new_metrics; none are kept if omitted.
+    - snapshot_path (str, optional): JSON file to refresh with the metrics.
+    - snapshot_interval (float): Seconds between snapshot file writes.
+    - history_limit (int or None): Number of most recent days kept in the
+    game's profit_history, so long runs use bounded memory; None keeps all.
+
+    Returns:
+    - dict: The final game state.
+    """
+    decision = decision or HEADLESS_DECISION
+    game = new_game(seed)
+    game['profit_history'] = deque(maxlen=history_limit)
+    last_tick = last_snapshot = time.perf_counter()
+    for _ in range(days):
+        report = play_day(game, decision)
+        if metrics is None:
+            continue
+        now = time.perf_counter()
+        record_day_metrics(metrics, report, game, now - last_tick)
+        last_tick = now
+        if snapshot_path and now - last_snapshot >= snapshot_interval:
+            write_metrics_snapshot(metrics, snapshot_path)
+            last_snapshot = now
+
+    if metrics is not None and snapshot_path:
+        write_metrics_snapshot(metrics, snapshot_path)
+    return game
+
+
+# === Sensitivity Analysis ===
+
+# Range explored for each knob during sensitivity analysis
+SENSITIVITY_FACTORS = {
+    'price': (5.5, 15.0),
+    'customer_sensitivity': (0.5, 3.0),
+    'base_cost': (3.0, 7.0),
+    'chef_wage': (10.0, 20.0),
+    'waiter_wage': (8.0, 16.0),
+    'dishwasher_wage': (7.0, 13.0),
+    'probability_positive': (0.0, 1.0),
+    'weight_staff_efficiency': (0.2, 0.6),
+    'weight_cleanliness': (0.1, 0.5),
+    'weight_wait_time': (0.1, 0.5)
+}
+
+# Decision and settings used for everything that is not a sensitivity factor
+SENSITIVITY_BASELINE = {
+    'staff_efficiency': 80,
+    'cleanliness': 80,
+    'wait_time': 10,
+    'shift_hours': 8
+}
+
+
+def pipeline_day_profit(report):
+    """
+    Profit of one day: the menu profit plus the revenue simulation's daily
+    profit. Note that the game's own 'total_profit' (the "Total Profit"
+    printed at the end) only adds up the menu profit.
+
+    In this model the random events only move reputation and the running
+    sales figure, and the satisfaction score is only displayed, so
+    probability_positive and the satisfaction weights have no effect on
+    this objective.
+
+    Parameters:
+    - report (dict): Output of play_day.
+
+    Returns:
+    - float: The day's profit.
+    """
+    return report['menu_result']['total_profit'] + report['daily_report']['daily_profit']
+
+
+def satisfaction_weighted_day_profit(report):
+    """
+    Day profit under an extra modelling assumption: only the satisfied share
+    of customers counts, so the menu profit is scaled by the overall
+    satisfaction score / 100. The game itself has no such coupling; use
+    this objective to explore how the satisfaction weights would matter if
+    it did.
+
+    Parameters:
+    - report (dict): Output of play_day.
+
+    Returns:
+    - float: The day's profit under the assumption.
+    """
+    return (report['menu_result']['total_profit'] * report['satisfaction_score'] / 100
+            + report['daily_report']['daily_profit'])
+
+
+# Objectives the sensitivity analysis can measure, by name
+SENSITIVITY_OBJECTIVES = {
+    'profit': pipeline_day_profit,
+    'satisfaction-weighted': satisfaction_weighted_day_profit
+}
+
+
+def evaluate_pipeline(factors, seed, days=7, objective='profit'):
+    """
+    Runs the full day pipeline for a number of days with the given factor
+    values and returns the objective summed over all days.
+
+    The seed drives every random event, so evaluations that share a seed
+    see the same luck (common random numbers) and differ only by their
+    factors.
+
+    Parameters:
+    - factors (dict): A value for every key of SENSITIVITY_FACTORS.
+    - seed (int): Seed for the game's random events.
+    - days (int): Number of days to play.
+    - objective (str): Key of SENSITIVITY_OBJECTIVES.
+
+    Returns:
+    - float: Total of the objective over all days.
+    """
+    config = {
+        'base_cost': factors['base_cost'],
+        'customer_sensitivity': factors['customer_sensitivity'],
+        'probability_positive': factors['probability_positive'],
+        'metric_weights': {
+            'staff_efficiency': factors['weight_staff_efficiency'],
+            'cleanliness': factors['weight_cleanliness'],
+            'wait_time': factors['weight_wait_time']
+        },
+        'shift_hours': SENSITIVITY_BASELINE['shift_hours']
+    }
+    decision = {
+        'price': factors['price'],
+        'staff_efficiency': SENSITIVITY_BASELINE['staff_efficiency'],
+        'cleanliness': SENSITIVITY_BASELINE['cleanliness'],
+        'wait_time': SENSITIVITY_BASELINE['wait_time'],
+        'wages': {
+            'Chef': factors['chef_wage'],
+            'Waiter': factors['waiter_wage'],
+            'Dishwasher': factors['dishwasher_wage']
+        }
+    }
+
+    day_objective = SENSITIVITY_OBJECTIVES[objective]
+    game = new_game(seed, config)
+    return sum(day_objective(play_day(game, decision)) for _ in range(days))
+
+
+def _evaluate_chunk(chunk, days, objective):
+    return [evaluate_pipeline(factors, seed, days, objective) for factors, seed in chunk]
+
+
+def evaluate_pipeline_batch(runs, days=7, workers=1, objective='profit'):
+    """
+    Evaluates many (factors, seed) runs, optionally across several processes.
+
+    Parameters:
+    - runs (list): (factors dict, seed) pairs.
+    - days (int): Number of days per run.
+    - workers (int): Number of worker processes; 1 runs in this process.
+    - objective (str): Key of SENSITIVITY_OBJECTIVES.
+
+    Returns:
+    - list: Objective total of each run, in order.
+    """
+    if workers <= 1 or len(runs) < 2:
+        return _evaluate_chunk(runs, days, objective)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    size = math.ceil(len(runs) / (workers * 4))
+    chunks = [runs[i:i + size] for i in range(0, len(runs), size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_evaluate_chunk, chunks, [days] * len(chunks),
+                               [objective] * len(chunks))
+        return [profit for chunk in results for profit in chunk]
+
+
+def _scale_factors(unit_point, factor_ranges):
+    return {
+        name: low + u * (high - low)
+        for u, (name, (low, high)) in zip(unit_point, factor_ranges.items())
+    }
+
+
+def _variance(values):
+    mean = sum(values) / len(values)
+    return sum((value - mean) ** 2 for value in values) / len(values)
+
+
+def sobol_indices(budget=2400, days=7, seed=0, workers=1, factor_ranges=None,
+                  objective='profit'):
+    """
+    Estimates first-order and total-order Sobol indices of the total profit
+    with the Saltelli/Jansen estimators. The outputs are centred on their
+    mean first, which keeps the first-order estimator's noise down.
+
+    First-order indices should lie in [0, total_order]. Any factor whose
+    estimates break that by more than three standard errors is listed under
+    'warnings'; a larger budget usually clears them.
+
+    The budget is the maximum number of pipeline evaluations; with k factors
+    it buys N = budget // (k + 2) base samples. Each base sample uses one
+    seed for all of its k + 2 evaluations.
+
+    Parameters:
+    - budget (int): Maximum number of pipeline evaluations.
+    - days (int): Number of days per evaluation.
+    - seed (int): Seed for the sampling and the event seeds.
+    - workers (int): Number of worker processes.
+    - factor_ranges (dict, optional): Overrides SENSITIVITY_FACTORS.
+    - objective (str): Key of SENSITIVITY_OBJECTIVES.
+
+    Returns:
+    - dict: 'evaluations', 'warnings' and, per factor, 'first_order' (with
+    its standard error 'first_order_se') and 'total_order'.
+
+    Raises:
+    - ValueError: If the budget is too small for two base samples.
+    """
+    factor_ranges = factor_ranges or SENSITIVITY_FACTORS
+    k = len(factor_ranges)
+    n = budget // (k + 2)
+    if n < 2:
+        raise ValueError(f"budget must be at least {2 * (k + 2)} evaluations.")
+
+    rng = random.Random(seed)
+    a = [[rng.random() for _ in range(k)] for _ in range(n)]
+    b = [[rng.random() for _ in range(k)] for _ in range(n)]
+    seeds = [rng.randrange(2 ** 32) for _ in range(n)]
+
+    # Row j of every matrix shares seeds[j]; AB_i is A with column i from B
+    points = a + b + [a[j][:i] + [b[j][i]] + a[j][i + 1:] for i in range(k) for j in range(n)]
+    runs = [(_scale_factors(point, factor_ranges), seeds[index % n])
+            for index, point in enumerate(points)]
+    results = evaluate_pipeline_batch(runs, days, workers, objective)
+
+    mean = sum(results[:2 * n]) / (2 * n)
+    results = [result - mean for result in results]
+    f_a, f_b = results[:n], results[n:2 * n]
+    variance = _variance(f_a + f_b)
+    indices = {}
+    warnings = []
+    for i, name in enumerate(factor_ranges):
+        f_ab = results[(2 + i) * n:(3 + i) * n]
+        terms = [fb * (fab - fa) for fa, fb, fab in zip(f_a, f_b, f_ab)]
+        first = sum(terms) / n
+        first_se = math.sqrt(_variance(terms) / n)
+        total_terms = [(fa - fab) ** 2 / 2 for fa, fab in zip(f_a, f_ab)]
+        total = sum(total_terms) / n
+        gap_se = math.sqrt(_variance([t - tt for t, tt in zip(terms, total_terms)]) / n)
+        if not variance:
+            indices[name] = {'first_order': 0.0, 'first_order_se': 0.0, 'total_order': 0.0}
+            continue
+        indices[name] = {
+            'first_order': round(first / variance, 4),
+            'first_order_se': round(first_se / variance, 4),
+            'total_order': round(total / variance, 4)
+        }
+        if first < -3 * first_se or first > total + 3 * gap_se:
+            warnings.append(f"{name}: first_order {first / variance:.4f} is outside "
+                            f"[0, total_order {total / variance:.4f}] beyond noise")
+    return {'evaluations': len(runs), 'warnings': warnings, 'factors': indices}
+
+
+def morris_effects(budget=600, days=7, seed=0, workers=1, levels=4, factor_ranges=None,
+                   objective='profit'):
+    """
+    Screens the factors with Morris elementary effects. Each trajectory
+    starts at a random grid point and moves one factor at a time by
+    levels / (2 * (levels - 1)) of its range, reusing one seed throughout.
+
+    Parameters:
+    - budget (int): Maximum number of pipeline evaluations; buys
+    budget // (k + 1) trajectories for k factors.
+    - days (int): Number of days per evaluation.
+    - seed (int): Seed for the trajectories and the event seeds.
+    - workers (int): Number of worker processes.
+    - levels (int): Number of grid levels (even).
+    - factor_ranges (dict, optional): Overrides SENSITIVITY_FACTORS.
+    - objective (str): Key of SENSITIVITY_OBJECTIVES.
+
+    Returns:
+    - dict: 'evaluations' and, per factor, 'mu_star' (mean absolute effect,
+    in profit per full factor range) and 'sigma' (spread of the effects).
+
+    Raises:
+    - ValueError: If the budget is too small for two trajectories.
+    """
+    factor_ranges = factor_ranges or SENSITIVITY_FACTORS
+    k = len(factor_ranges)
+    trajectories = budget // (k + 1)
+    if trajectories < 2:
+        raise ValueError(f"budget must be at least {2 * (k + 1)} evaluations.")
+
+    rng = random.Random(seed)
+    delta = levels / (2 * (levels - 1))
+    # Starting levels low enough that a step of delta stays inside [0, 1]
+    start_levels = [level / (levels - 1) for level in range(levels // 2)]
+
+    runs = []
+    orders = []
+    for _ in range(trajectories):
+        point = [rng.choice(start_levels) for _ in range(k)]
+        order = rng.sample(range(k), k)
+        run_seed = rng.randrange(2 ** 32)
+        runs.append((_scale_factors(point, factor_ranges), run_seed))
+        for i in order:
+            point = point[:i] + [point[i] + delta] + point[i + 1:]
+            runs.append((_scale_factors(point, factor_ranges), run_seed))
+        orders.append(order)
+    results = evaluate_pipeline_batch(runs, days, workers, objective)
+
+    effects = {i: [] for i in range(k)}
+    for t, order in enumerate(orders):
+        path = results[t * (k + 1):(t + 1) * (k + 1)]
+        for step, i in enumerate(order):
+            effects[i].append((path[step + 1] - path[step]) / delta)
+
+    indices = {}
+    for i, name in enumerate(factor_ranges):
+        mean = sum(effects[i]) / trajectories
+        indices[name] = {
+            'mu_star': round(sum(abs(effect) for effect in effects[i]) / trajectories, 2),
+            'sigma': round(math.sqrt(sum((effect - mean) ** 2 for effect in effects[i])
+                                     / (trajectories - 1)), 2)
+        }
+    return {'evaluations': len(runs), 'factors': indices}
+
+
+def sensitivity_report(method='sobol', budget=None, days=7, seed=0, workers=1,
+                       objective='profit'):
+    """
+    Runs a sensitivity analysis of profit over the full day pipeline and
+    ranks the knobs from most to least important.
+
+    Parameters:
+    - method (str): 'sobol' (first/total-order indices) or 'morris'
+    (elementary effects screening, much cheaper).
+    - budget (int, optional): Maximum number of pipeline evaluations.
+    - days (int): Number of days per evaluation.
+    - seed (int): Seed for reproducible results.
+    - workers (int): Number of worker processes.
+    - objective (str): Key of SENSITIVITY_OBJECTIVES: 'profit' (menu profit
+    plus revenue-simulation profit) or 'satisfaction-weighted' (see
+    satisfaction_weighted_day_profit).
+
+    Returns:
+    - dict: The method, the objective, its indices per factor and the 'ranking'.
+
+    Raises:
+    - ValueError: If the method or the objective is unknown.
+    """
+    if objective not in SENSITIVITY_OBJECTIVES:
+        raise ValueError(f"Unknown sensitivity objective: {objective}")
+    if method == 'sobol':
+        result = sobol_indices(budget or 2400, days, seed, workers, objective=objective)
+        key = 'total_order'
+    elif method == 'morris':
+        result = morris_effects(budget or 600, days, seed, workers, objective=objective)
+        key = 'mu_star'
+    else:
+        raise ValueError(f"Unknown sensitivity method: {method}")
+
+    ranking = sorted(result['factors'], key=lambda name: result['factors'][name][key],
+                     reverse=True)
+    return {'method': method, 'objective': objective, 'days': days, **result,
+            'ranking': ranking}
+
 
 if __name__ == "__main__":
-    main_game()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Restaurant Tycoon")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="seed for the random events")
+    parser.add_argument('--record', metavar='PATH',
+                        help="save the decisions of this game to a session file")
+    parser.add_argument('--replay', metavar='PATH',
+                        help="re-play a recorded session file headlessly")
+    parser.add_argument('--what-if', nargs='+', metavar=('DAY', 'NAME=VALUE'),
+                        help="with --replay, change decisions on DAY, e.g. 40 price=11")
+    parser.add_argument('--headless', type=int, metavar='DAYS',
+                        help="play DAYS days without prompts and track live metrics")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="with --headless, serve Prometheus metrics on this local port")
+    parser.add_argument('--metrics-file', metavar='PATH',
+                        help="with --headless, refresh a JSON metrics snapshot at PATH")
+    parser.add_argument('--check-batch', action='store_true',
+                        help="check that the batch paths match the single-restaurant ones")
+    parser.add_argument('--sensitivity', choices=['sobol', 'morris'],
+                        help="print a sensitivity report instead of playing")
+    parser.add_argument('--budget', type=int, default=None,
+                        help="maximum pipeline evaluations for --sensitivity")
+    parser.add_argument('--objective', choices=list(SENSITIVITY_OBJECTIVES), default='profit',
+                        help="what --sensitivity measures")
+    parser.add_argument('--days', type=int, default=7,
+                        help="days per evaluation for --sensitivity")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes for --sensitivity")
+    args = parser.parse_args()
+    if args.headless is None and (args.metrics_port is not None or args.metrics_file):
+        parser.error("--metrics-port and --metrics-file require --headless")
+    if args.what_if and not args.replay:
+        parser.error("--what-if requires --replay")
+    if args.headless is not None and args.headless < 0:
+        parser.error("--headless DAYS must not be negative")
+
+    if args.check_batch:
+        mismatches = check_batch_paths(args.seed or 0)
+        print('\n'.join(mismatches) or "Batch paths match the single-restaurant paths.")
+        if mismatches:
+            raise SystemExit(1)
+    elif args.replay and args.what_if:
+        session = load_session(args.replay)
+        cache = build_replay_cache(session)
+        roles = session['config'].get('min_wages', min_wages)
+        try:
+            if not args.what_if[0].lstrip('-').isdigit():
+                raise ValueError(f"--what-if DAY must be a whole number, got '{args.what_if[0]}'.")
+            day = int(args.what_if[0])
+            changes = parse_changes(args.what_if[1:], roles)
+            result = what_if(cache, day, changes)
+        except ValueError as error:
+            parser.error(str(error))
+        del result['reports']
+        print(json.dumps(result, indent=2))
+    elif args.replay:
+        game, reports = replay_session(load_session(args.replay))
+        print(f"Replayed {len(reports)} days. Total Profit: ${game['total_profit']:.2f}")
+    elif args.headless is not None:
+        metrics = new_metrics()
+        if args.metrics_port is not None:
+            serve_metrics(metrics, args.metrics_port)
+        game = run_headless(args.headless, seed=args.seed, metrics=metrics,
+                            snapshot_path=args.metrics_file)
+        print(f"Played {args.headless} days. Total Profit: ${game['total_profit']:.2f}")
+    elif args.sensitivity:
+        report = sensitivity_report(args.sensitivity, args.budget, args.days,
+                                    args.seed or 0, args.workers, args.objective)
+        print(json.dumps(report, indent=2))
+    else:
+        main_game(args.seed, args.record)